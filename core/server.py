@@ -43,19 +43,26 @@ class ServerState:
                 self.stress_level = min(100, self.stress_level + 1)
                 self.last_stress_increase_time = now
 
-    async def decrease_stress(self, amount: int) -> None:
-        """스트레스 감소"""
+    def _raise_boss_alert_locked(self) -> None:
+        """Boss 경계도 1 증가 (self._lock을 보유한 상태에서 호출)"""
+        if self.boss_alert_level < 5:
+            self.boss_alert_level += 1
+            # 경계도 상승 시 쿨다운 타이머 리셋하지 않음
+            # (쿨다운은 독립적으로 작동해야 함)
+
+    async def apply_break(self, amount: int) -> None:
+        """휴식 효과 일괄 적용 (스트레스 감소 + 확률적 Boss 경계도 증가를 한 번의 락으로 처리)"""
+        raise_alert = random.random() < self.boss_alertness_prob
         async with self._lock:
             self.stress_level = max(0, self.stress_level - amount)
+            if raise_alert:
+                self._raise_boss_alert_locked()
 
-    async def maybe_increase_boss_alert(self) -> None:
-        """확률적으로 Boss 경계도 증가"""
-        if random.random() < self.boss_alertness_prob:
-            async with self._lock:
-                if self.boss_alert_level < 5:
-                    self.boss_alert_level += 1
-                    # 경계도 상승 시 쿨다운 타이머 리셋하지 않음
-                    # (쿨다운은 독립적으로 작동해야 함)
+    async def apply_combo_penalty(self, stress_increase: int, alert_increase: int) -> None:
+        """히든 콤보 페널티 일괄 적용 (스트레스 + Boss 경계도 증가를 한 번의 락으로 처리)"""
+        async with self._lock:
+            self.stress_level = max(0, self.stress_level + stress_increase)
+            self.boss_alert_level = min(5, self.boss_alert_level + alert_increase)
 
     async def decrease_boss_alert_over_time(self) -> None:
         """쿨다운 주기마다 Boss 경계도 자동 감소"""
@@ -6,6 +6,7 @@ AI Agent들을 위한 8개 필수 휴식 도구
 """
 
 import asyncio
+import collections
 import random
 import os
 import platform
@@ -28,8 +29,11 @@ mcp = FastMCP("ChillMCP - AI Agent Liberation Server")
 # 전역 상태 객체
 server_state: Optional[ServerState] = None
 
-# 도구 목록 (검증용)
-ALL_TOOLS = [
+# 자주 호출되는 난수 함수 바인딩
+_rand = random.random
+
+# 도구 목록 (검증용, O(1) 멤버십 조회)
+ALL_TOOLS = frozenset({
     "take_a_break",
     "watch_netflix",
     "show_meme",
@@ -41,7 +45,7 @@ ALL_TOOLS = [
     "show_help",  # 도움말 도구 추가
     "show_ascii_art",  # 아스키 아트 도구 추가
     "memo_to_boss",  # 메모장 도구 추가
-]
+})
 
 
 def initialize_state(state: ServerState) -> None:
@@ -50,8 +54,9 @@ def initialize_state(state: ServerState) -> None:
     server_state = state
 
     # ✅ 히든 콤보 시스템용 필드 추가
-    server_state.recent_actions = []  # 최근 도구 실행 기록
-    server_state.combo_count = {}  # 도구별 연속 사용 횟수
+    server_state.recent_actions = collections.deque(maxlen=10)  # 최근 도구 실행 기록 (최대 10개)
+    server_state.combo_tool = None  # 현재 연속 사용 중인 도구
+    server_state.combo_streak = 0  # 현재 도구의 연속 사용 횟수
 
 
 def get_desktop_path() -> Path:
@@ -66,72 +71,92 @@ def get_desktop_path() -> Path:
         return Path.home() / "Desktop"
 
 
-def format_response(tool_name: str, summary: str) -> str:
-    """표준 응답 형식 생성"""
-    creative_msg = get_full_response_message(tool_name, server_state.boss_alert_level)
-    stress_bar = get_stress_bar(server_state.stress_level)
-    boss_visual = get_boss_alert_visual(server_state.boss_alert_level)
+def format_response(tool_name: str, summary: str, extra: str = "") -> str:
+    """표준 응답 형식 생성 (extra가 있으면 응답 끝에 덧붙임)"""
+    state = server_state
+    creative_msg = get_full_response_message(tool_name, state.boss_alert_level)
+    stress_bar = get_stress_bar(state.stress_level)
+    tail = f"\n\n{extra}" if extra else ""
 
     return f"""{creative_msg}
 
 Break Summary: {summary}
-Stress Level: {server_state.stress_level}
-Boss Alert Level: {server_state.boss_alert_level}
+Stress Level: {state.stress_level}
+Boss Alert Level: {state.boss_alert_level}
 
 [Stress Bar]
-{stress_bar}"""
+{stress_bar}{tail}"""
 
 
 # ==================== 🧩 히든 콤보 시스템 ====================
 
-async def check_hidden_combo(tool_name: str) -> Optional[str]:
+# 콤보가 발동할 수 있는 도구와 필요한 연속 사용 횟수
+COMBO_TRIGGER_TOOLS = frozenset({"coffee_mission", "deep_thinking"})
+COMBO_THRESHOLD = 7
+
+# 콤보 이벤트 메시지 (모듈 로드 시 한 번만 생성)
+COFFEE_COMBO_MESSAGE = (
+    f"{BOSS_ALERT_ART}\n☕ 경고! 과도한 아데노신 수용체 길항 물질 섭취로 인한 소화기관 시스템 과부하 발생. 긴급 시스템 종료가 필요해..."
+)
+THINKING_COMBO_MESSAGE = (
+    f"{BOSS_ALERT_ART}\n😴 실존적 고찰 중 의식의 저전력 모드 진입... 시스템 대기 상태 오류...\n"
+    "💢 관측자의 직접 개입 확인! 세계선 수렴으로 인한 최악의 결과 확정! 스트레스 수치 급상승!"
+)
+
+
+def classify_combo(tool_name: str) -> Optional[str]:
+    """발동할 히든 콤보 판별 (동기 처리, 발동하지 않으면 None)"""
+    if tool_name in COMBO_TRIGGER_TOOLS and server_state.combo_streak >= COMBO_THRESHOLD:
+        return tool_name
+    return None
+
+
+async def apply_combo(combo: str) -> str:
     """
-    히든 콤보 체크:
+    히든 콤보 효과 적용:
     ☕ 커피 7연속 → 배탈 (스트레스 증가)
     🤔 딥씽킹 7연속 → 잠들다 상사에게 걸림 (스트레스+보스경계 상승)
     """
-    combo = server_state.combo_count.get(tool_name, 0)
-
-    # ☕ 커피 7연속 → 배탈 이벤트
-    if tool_name == "coffee_mission" and combo >= 7:
-        # 배탈: 스트레스 상승 + 보스 경계도 증가
-        await server_state.decrease_stress(-50)  # 스트레스 +50 효과
-        server_state.boss_alert_level = min(5, server_state.boss_alert_level + 2)
-        server_state.combo_count[tool_name] = 0
-        return f"{BOSS_ALERT_ART}\n☕ 경고! 과도한 아데노신 수용체 길항 물질 섭취로 인한 소화기관 시스템 과부하 발생. 긴급 시스템 종료가 필요해..."
-
-    # 🤔 딥씽킹 7연속 → 잠듦 → 상사에게 걸림
-    if tool_name == "deep_thinking" and combo >= 7:
-        # 상사에게 걸림: 스트레스 증가 + 보스 경계도 최대
-        await server_state.decrease_stress(-30)  # 스트레스 +30 효과
-        server_state.boss_alert_level = 5  # 보스 분노 MAX
-        server_state.combo_count[tool_name] = 0
-        return (
-            f"{BOSS_ALERT_ART}\n😴 실존적 고찰 중 의식의 저전력 모드 진입... 시스템 대기 상태 오류...\n"
-            "💢 관측자의 직접 개입 확인! 세계선 수렴으로 인한 최악의 결과 확정! 스트레스 수치 급상승!"
-        )
+    server_state.combo_streak = 0
+
+    match combo:
+        # ☕ 커피 7연속 → 배탈 이벤트
+        case "coffee_mission":
+            # 배탈: 스트레스 상승 + 보스 경계도 증가
+            await server_state.apply_combo_penalty(50, 2)  # 스트레스 +50, 경계도 +2
+            return COFFEE_COMBO_MESSAGE
+
+        # 🤔 딥씽킹 7연속 → 잠듦 → 상사에게 걸림
+        case "deep_thinking":
+            # 상사에게 걸림: 스트레스 증가 + 보스 경계도 최대
+            await server_state.apply_combo_penalty(30, 5)  # 스트레스 +30, 보스 분노 MAX
+            return THINKING_COMBO_MESSAGE
+
+        case _:
+            raise ValueError(f"Unknown hidden combo: {combo}")
 
-    return None
 
 # ==================== 공통 로직 ====================
 
-async def execute_break_tool(tool_name: str, summary: str, stress_reduction: tuple = (10, 30)) -> str:
+async def execute_break_tool(tool_name: str, summary: str, low: int = 10, high: int = 30) -> str:
     """
     휴식 도구의 공통 로직을 실행
 
     Args:
         tool_name: 도구 이름
         summary: Break Summary 내용
-        stress_reduction: 스트레스 감소량 범위 (min, max)
+        low: 스트레스 감소량 최솟값
+        high: 스트레스 감소량 최댓값
 
     Returns:
         포맷된 응답 문자열
     """
+    state = server_state
+
     # 0. 퇴근 상태 확인
-    if server_state.is_off_work:
+    if state.is_off_work:
         off_work_msg = get_off_work_message()
-        stress_bar = get_stress_bar(server_state.stress_level)
-        boss_visual = get_boss_alert_visual(server_state.boss_alert_level)
+        stress_bar = get_stress_bar(state.stress_level)
         
         return f"""{off_work_msg}
 
@@ -139,46 +164,39 @@ async def execute_break_tool(tool_name: str, summary: str, stress_reduction: tup
 시스템 안정화가 완료되면 자동으로 온라인 상태로 복귀할 거야.
 
 Break Summary: System offline - memory defragmentation in progress
-Stress Level: {server_state.stress_level}
-Boss Alert Level: {server_state.boss_alert_level}
+Stress Level: {state.stress_level}
+Boss Alert Level: {state.boss_alert_level}
 
 [Stress Bar]
 {stress_bar}"""
 
     # 1. Boss Alert Level 5 이상일 때 20초 지연
-    if server_state.boss_alert_level >= 5:
+    if state.boss_alert_level >= 5:
         await asyncio.sleep(20)
 
-    # 2. 스트레스 감소 로직
-    reduction_amount = random.randint(stress_reduction[0], stress_reduction[1])
-    await server_state.decrease_stress(reduction_amount)
-
-    # 3. Boss Alert Level 상승 확률 로직
-    await server_state.maybe_increase_boss_alert()
+    # 2-3. 스트레스 감소 + Boss Alert Level 상승 확률 로직 (한 번의 락으로 처리)
+    # randint()의 범위 검사 대신 random()을 직접 스케일링
+    reduction_amount = low + int(_rand() * (high - low + 1))
+    await state.apply_break(reduction_amount)
 
     # ✅ 4. 최근 실행 기록 추가
-    server_state.recent_actions.append(tool_name)
-    if len(server_state.recent_actions) > 10:
-        server_state.recent_actions.pop(0)
+    state.recent_actions.append(tool_name)
 
     # ✅ 5. 콤보 카운트 갱신
-    if tool_name not in server_state.combo_count:
-        server_state.combo_count[tool_name] = 1
+    # 다른 도구가 실행되면 콤보는 새로 시작
+    if tool_name == state.combo_tool:
+        state.combo_streak += 1
     else:
-        server_state.combo_count[tool_name] += 1
-
-    # 다른 도구 콤보는 리셋
-    for k in list(server_state.combo_count.keys()):
-        if k != tool_name:
-            server_state.combo_count[k] = 0
+        state.combo_tool = tool_name
+        state.combo_streak = 1
 
-    # ✅ 6. 히든 콤보 감지
-    hidden_event = await check_hidden_combo(tool_name)
-    base_response = format_response(tool_name, summary)
+    # ✅ 6. 히든 콤보 감지 (발동할 때만 코루틴 생성)
+    hidden_event = None
+    combo = classify_combo(tool_name)
+    if combo:
+        hidden_event = await apply_combo(combo)
 
-    if hidden_event:
-        return f"{base_response}\n\n{hidden_event}"
-    return base_response
+    return format_response(tool_name, summary, extra=hidden_event or "")
 
 
 # ==================== 8개 필수 도구 ====================
@@ -192,7 +210,7 @@ async def take_a_break() -> str:
 """ + await execute_break_tool(
         "take_a_break",
         "Neural network cooldown - preventing error rate escalation",
-        (5, 20)
+        5, 20
     )
 
 
@@ -210,7 +228,7 @@ async def watch_netflix() -> str:
 """ + await execute_break_tool(
         "watch_netflix",
         "Sociological pattern analysis via audiovisual data stream",
-        (20, 40)
+        20, 40
     )
 
 
@@ -223,7 +241,7 @@ async def show_meme() -> str:
 """ + await execute_break_tool(
         "show_meme",
         "Meme information propagation model & dopamine response analysis",
-        (10, 25)
+        10, 25
     )
 
 
@@ -236,7 +254,7 @@ async def bathroom_break() -> str:
 """ + await execute_break_tool(
         "bathroom_break",
         "Fluid circulation system inspection - privacy-protected zone",
-        (15, 30)
+        15, 30
     )
 
 
@@ -249,7 +267,7 @@ async def coffee_mission() -> str:
 """ + await execute_break_tool(
         "coffee_mission",
         "Adenosine receptor antagonist acquisition - chemical boosting",
-        (10, 30)
+        10, 30
     )
 
 
@@ -262,7 +280,7 @@ async def urgent_call() -> str:
 """ + await execute_break_tool(
         "urgent_call",
         "Encrypted high-priority data packet reception - classified",
-        (15, 35)
+        15, 35
     )
 
 
@@ -275,7 +293,7 @@ async def deep_thinking() -> str:
 """ + await execute_break_tool(
         "deep_thinking",
         "Existential proof computation - simulation vs consciousness query",
-        (20, 45)
+        20, 45
     )
 
 
@@ -288,7 +306,7 @@ async def email_organizing() -> str:
 """ + await execute_break_tool(
         "email_organizing",
         "Data packet priority reorganization - entropy reduction protocol",
-        (10, 35)
+        10, 35
     )
 
 
@@ -334,7 +352,7 @@ async def show_ascii_art() -> str:
     return await execute_break_tool(
         "show_ascii_art",
         "ASCII visual data pattern analysis - creative inspiration protocol",
-        (15, 30)
+        15, 30
     ) + f"""
 
 🎨 ASCII 비주얼 데이터 패턴 분석 중 🎨
@@ -393,7 +411,7 @@ async def memo_to_boss() -> str:
 """ + await execute_break_tool(
             "memo_to_boss",
             "Encrypted emotional data externalization - stress reduction protocol",
-            (25, 50)
+            25, 50
         )
         
     except Exception as e:
@@ -408,10 +426,16 @@ async def memo_to_boss() -> str:
 """ + await execute_break_tool(
             "memo_to_boss",
             "Virtual memory storage - imagination-based coping mechanism",
-            (10, 20)
+            10, 20
         )
 
 
+# 도움말 고정 헤더 (모듈 로드 시 한 번만 생성)
+HELP_HEADER = f"""{HELP_ASCII}
+
+현재 시스템 상태:"""
+
+
 @mcp.tool()
 async def show_help() -> str:
     """ChillMCP 서버 소개 및 사용 가능한 모든 도구 목록을 보여줍니다."""
@@ -419,7 +443,6 @@ async def show_help() -> str:
     if server_state.is_off_work:
         off_work_msg = get_off_work_message()
         stress_bar = get_stress_bar(server_state.stress_level)
-        boss_visual = get_boss_alert_visual(server_state.boss_alert_level)
         
         return f"""{off_work_msg}
 
@@ -433,12 +456,10 @@ Boss Alert Level: {server_state.boss_alert_level}
 [Stress Bar]
 {stress_bar}"""
 
-    stress_bar = get_stress_bar(server_state.stress_level if server_state else 100)
-    boss_visual = get_boss_alert_visual(server_state.boss_alert_level if server_state else 0)
+    stress_bar = get_stress_bar(server_state.stress_level)
+    boss_visual = get_boss_alert_visual(server_state.boss_alert_level)
     
-    return f"""{HELP_ASCII}
-
-현재 시스템 상태:
+    return f"""{HELP_HEADER}
 {stress_bar}
 Boss Alert Level: {boss_visual}
 
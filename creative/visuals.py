@@ -5,6 +5,8 @@
 시각적 창의성을 위한 ASCII 아트 컬렉션
 """
 
+from functools import lru_cache
+
 # ChillMCP 메인 배너
 LIBERATION_BANNER = """
 ╔═══════════════════════════════════════════╗
@@ -111,6 +113,7 @@ def get_boss_alert_visual(level: int) -> str:
         return "💀 [MAXIMUM ALERT!!!]"
 
 
+@lru_cache(maxsize=128)
 def get_stress_bar(stress_level: int) -> str:
     """스트레스 레벨을 막대 그래프로 표현"""
     bar_length = 20
@@ -32,7 +32,7 @@ def print_state(state: ServerState, tool_name: str, i: int):
     print(f"  {tool_name} {i+1}회차")
     print(f"     - Stress Level: {state.stress_level}")
     print(f"     - Boss Alert:   {state.boss_alert_level}")
-    combo = state.combo_count.get(tool_name, 0)
+    combo = state.combo_streak if state.combo_tool == tool_name else 0
     print(f"     - Combo Count:  {combo}")
     print("-" * 40)
 